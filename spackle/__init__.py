@@ -2,22 +2,19 @@
 
 import click
 import enum
+import functools
 import importlib
 import json
 import os
 import pathlib
 import platform
+import tempfile
 import time
 import shutil
-import sqlite3
 import subprocess
 import sys
-import tempfile
 
 import colorama
-import pydantic
-import fastmcp
-import requests
 
 
 ##########
@@ -28,7 +25,6 @@ class Provider(enum.Enum):
   Foo = 'foo'
 
 
-from .jira import parse_jira_to_markdown, fetch_jira_xml_from_url
 from .repo import RepoConfig
 
 from abc import abstractmethod
@@ -40,76 +36,103 @@ from typing import Protocol, Optional, List, Callable, Dict
 from .profiles import profiles
 
 
+# Serialize configs through orjson's C encoder when it's available; the
+# stdlib json module is a drop-in fallback
+try:
+  import orjson
+
+  def _json_dumps(obj) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+  _json_loads = orjson.loads
+except ImportError:
+  def _json_dumps(obj) -> bytes:
+    return json.dumps(obj, indent=2).encode()
+
+  _json_loads = json.loads
+
+
+_user_code_cache = {}
+
+
+@functools.lru_cache(maxsize=256)
+def _realpath(path: str) -> str:
+  """Cached symlink resolution; hooks hit the same handful of paths per session"""
+  return os.path.realpath(path)
+
+
+def _exists(path) -> bool:
+  """Existence probe for hot paths; os.access(F_OK) asks the kernel a
+  yes/no question instead of pulling full stat metadata like os.path.exists"""
+  return os.access(path, os.F_OK)
+
+
 #########
 # PATHS #
 #########
+@functools.lru_cache(maxsize=None)
+def _find_spackle_root(cwd: str) -> str:
+  """Find project root by looking up from cwd until finding spackle.py, then go up from .spackle"""
+  # Build the suffix once; each level of the walk is then one concatenation
+  # and one access() instead of a three-arg os.path.join plus a stat
+  sentinel = f'{os.sep}.spackle{os.sep}spackle.py'
+  current_dir = cwd
+
+  while True:
+    if _exists(current_dir + sentinel):
+      return current_dir
+
+    index = current_dir.rfind(os.sep)
+    if index <= 0 or current_dir[:index] == current_dir:  # Stop at filesystem root
+      break
+    current_dir = current_dir[:index]
+
+  # If we can't find spackle.py, fall back to the starting directory
+  return cwd
+
+
 class SpacklePaths:
   def __init__(self):
-    self.file = os.path.dirname(os.path.abspath(__file__))
-    self.project = os.path.realpath(os.path.join(self.file, '..'))
-    self.source = os.path.join(self.project, 'spackle')
-    self.asset = os.path.join(self.project, 'asset')
-    self.prompts = os.path.join(self.asset, 'prompts')
-    self.templates = os.path.join(self.asset, 'templates')
-    self.user_md: str = os.path.join(self.templates, 'spackle.md')
-    self.user_py: str = os.path.join(self.templates, 'spackle.py')
-    self.claude = os.path.join(self.templates, 'claude')
-    self.claude_md = os.path.join(self.claude, 'CLAUDE.md')
-    self.mcp_config = os.path.join(self.claude, '.mcp.json')
+    # __file__ is already absolute on modern Pythons; only fix it up if not
+    source_file = __file__ if os.path.isabs(__file__) else os.path.abspath(__file__)
+    self.file = os.path.dirname(source_file)
+    self.project = os.path.realpath(f'{self.file}{os.sep}..')
+    self.source = f'{self.project}{os.sep}spackle'
+    self.asset = f'{self.project}{os.sep}asset'
+    self.prompts = f'{self.asset}{os.sep}prompts'
+    self.templates = f'{self.asset}{os.sep}templates'
+    self.user_md: str = f'{self.templates}{os.sep}spackle.md'
+    self.user_py: str = f'{self.templates}{os.sep}spackle.py'
+    self.claude = f'{self.templates}{os.sep}claude'
+    self.claude_md = f'{self.claude}{os.sep}CLAUDE.md'
+    self.mcp_config = f'{self.claude}{os.sep}.mcp.json'
+
+
+@functools.lru_cache(maxsize=1)
+def _spackle_paths() -> SpacklePaths:
+  """The package's own paths never change within a process; the realpath
+  syscalls in SpacklePaths.__init__ only need to happen once"""
+  return SpacklePaths()
 
 
 class InstallPaths:
   def __init__(self):
-    self.root: str = self._find_project_root()
-    self.spackle: str = os.path.join(self.root, '.spackle')
-    self.output = os.path.join(self.spackle, 'output')
-    self.prompts: str = os.path.join(self.spackle, 'prompts')
-    self.user_md: str = os.path.join(self.spackle, 'spackle.md')
-    self.user_py: str = os.path.join(self.spackle, 'spackle.py')
-
-  def _find_project_root(self) -> str:
-    """Find project root by looking up from cwd until finding spackle.py, then go up from .spackle"""
-    current_dir = os.getcwd()
-
-    while current_dir != os.path.dirname(current_dir):  # Stop at filesystem root
-      spackle_py_path = os.path.join(current_dir, '.spackle', 'spackle.py')
-      if os.path.exists(spackle_py_path):
-        spackle_dir = os.path.join(current_dir, '.spackle')
-        assert os.path.exists(spackle_dir), (
-          f'Expected .spackle directory at {spackle_dir}'
-        )
-        return current_dir
-      current_dir = os.path.dirname(current_dir)
-
-    # If we can't find spackle.py, fall back to current working directory
-    return os.getcwd()
+    self.root: str = _find_spackle_root(os.getcwd())
+    self.spackle: str = f'{self.root}{os.sep}.spackle'
+    self.output = f'{self.spackle}{os.sep}output'
+    self.prompts: str = f'{self.spackle}{os.sep}prompts'
+    self.user_md: str = f'{self.spackle}{os.sep}spackle.md'
+    self.user_py: str = f'{self.spackle}{os.sep}spackle.py'
 
 
 class ClaudePaths:
   def __init__(self):
-    self.root: str = self._find_project_root()
-    self.claude_md: str = os.path.join(self.root, 'CLAUDE.md')
-    self.mcp_config: str = os.path.join(self.root, '.mcp.json')
-    self.claude: str = os.path.join(self.root, '.claude')
-    self.settings: str = os.path.join(self.claude, 'settings.local.json')
-    self.commands: str = os.path.join(self.claude, 'commands')
-
-  def _find_project_root(self) -> str:
-    """Find project root by looking up from cwd until finding spackle.py, then go up from .spackle"""
-    current_dir = os.getcwd()
-
-    while current_dir != os.path.dirname(current_dir):  # Stop at filesystem root
-      spackle_py_path = os.path.join(current_dir, '.spackle', 'spackle.py')
-      if os.path.exists(spackle_py_path):
-        spackle_dir = os.path.join(current_dir, '.spackle')
-        assert os.path.exists(spackle_dir), (
-          f'Expected .spackle directory at {spackle_dir}'
-        )
-        return current_dir
-      current_dir = os.path.dirname(current_dir)
-
-    # If we can't find spackle.py, fall back to current working directory
-    return os.getcwd()
+    self.root: str = _find_spackle_root(os.getcwd())
+    self.claude_md: str = f'{self.root}{os.sep}CLAUDE.md'
+    self.mcp_config: str = f'{self.root}{os.sep}.mcp.json'
+    self.claude: str = f'{self.root}{os.sep}.claude'
+    self.settings: str = f'{self.claude}{os.sep}settings.local.json'
+    self.commands: str = f'{self.claude}{os.sep}commands'
 
 
 #######
@@ -121,15 +144,16 @@ class Server:
     pass
 
 
-class McpResult(pydantic.BaseModel):
+@dataclass(slots=True)
+class McpResult:
   return_code: int
   response: str
-  stderr: str
-  stdout: str
+  stderr: str = ''
+  stdout: str = ''
 
   @staticmethod
   def Ok(response: str):
-    return McpResult(return_code=0, response=response, stderr='', stdout='')
+    return McpResult(return_code=0, response=response)
 
 
 #########
@@ -167,6 +191,13 @@ class Hook:
   event: HookEvent
   tools: Optional[List[HookTool]]
   fn: Callable
+  # Computed once at registration; tools and event never change afterwards
+  matcher: str = field(init=False)
+  event_value: str = field(init=False)
+
+  def __post_init__(self):
+    self.matcher = '|'.join(tool.value for tool in (self.tools or []))
+    self.event_value = self.event.value
 
 
 class HookContext:
@@ -232,11 +263,20 @@ class Spackle:
     error = colorama.Fore.LIGHTRED_EX
     add = colorama.Fore.LIGHTGREEN_EX
 
+  @dataclass
+  class CopyOp:
+    source: str
+    dest: str
+    tree: bool = False
+    force: bool = False
+    log: bool = False
+    flag: str = None
+
   def __init__(self):
     colorama.init()
     self.colors = Spackle.Colors()
 
-    self.paths = SpacklePaths()
+    self.paths = _spackle_paths()
     self.install = InstallPaths()
 
     self.mcp_registry = {}
@@ -302,11 +342,11 @@ class Spackle:
     shutil.rmtree(claude.claude, ignore_errors=True)
 
     # Clean CLAUDE.md non-destructively
-    if os.path.exists(claude.claude_md):
+    if _exists(claude.claude_md):
       self._clean_claude_md(claude.claude_md)
 
     # Clean .mcp.json non-destructively
-    if os.path.exists(claude.mcp_config):
+    if _exists(claude.mcp_config):
       self._clean_mcp_config(claude.mcp_config)
 
   def build(self, provider: Provider = Provider.Claude) -> None:
@@ -327,30 +367,15 @@ class Spackle:
     os.makedirs(claude.claude, exist_ok=True)
     os.makedirs(claude.commands, exist_ok=True)
 
-    # .claude/commands
-    self._copy_tree(self.paths.prompts, install.prompts)
-
-    # .spackle/spackle.*
-    self._copy_file(
-      self.paths.user_md,
-      install.user_md,
-      force=False,
-      log=True,
-      flag='--overwrite-spackle',
-    )
-    self._copy_file(
-      self.paths.user_py,
-      install.user_py,
-      force=False,
-      log=True,
-      flag='--overwrite-spackle',
-    )
+    # Plan every template copy up front, then execute against one shared
+    # InstallPaths and one scandir per destination directory
+    self._execute_copies(self._plan_copies(install), install)
 
     # Create vendor symlinks for managed repositories
     self._create_vendor_symlinks(install)
 
     # Run the user's Python file
-    if os.path.exists(install.user_py):
+    if 'spackle.py' in self._scan_names(install.spackle):
       self._load_user_file()
 
     # @spackle.prompt
@@ -369,21 +394,26 @@ class Spackle:
       try:
         file_path = fn()
         file_path = os.path.join(install.root, file_path)
-        if not os.path.exists(file_path):
+        if not _exists(file_path):
           raise ValueError(
             f'Warning: Prompt file {file_path} not found, skipping {name}'
           )
 
-        shutil.copy2(file_path, os.path.join(claude.commands, f'{name}.md'))
+        # copyfile skips copy2's extra stat for mode propagation; rendered
+        # command files don't need the template's metadata
+        shutil.copyfile(file_path, os.path.join(claude.commands, f'{name}.md'))
 
       except Exception as e:
         print(f'Error copying prompt file for {name}: {e}')
 
+    # One scandir covers the "already configured?" probes on the project root
+    present = self._scan_names(claude.root)
+
     # CLAUDE.md - create or update non-destructively
-    self._update_claude_md(claude.claude_md)
+    self._update_claude_md(claude.claude_md, exists='CLAUDE.md' in present)
 
     # .mcp.json - create or update non-destructively
-    self._update_mcp_config(claude.mcp_config)
+    self._update_mcp_config(claude.mcp_config, exists='.mcp.json' in present)
 
     # .claude/settings.local.json - always update settings
     self._log_copy_action(claude.settings, force=True, flag='(always overwritten)')
@@ -394,8 +424,8 @@ class Spackle:
       'hooks': self._build_hooks(),
     }
 
-    with open(claude.settings, 'w') as file:
-      json.dump(settings, file, indent=2)
+    with open(claude.settings, 'wb') as file:
+      file.write(_json_dumps(settings))
 
   def run_server(self, name: str) -> None:
     self._load_user_file()
@@ -411,6 +441,12 @@ class Spackle:
 
     return self.tools[name]()
 
+  def run_tools(self, names: List[str]) -> List[McpResult]:
+    """Run several tools off a single user-code load, in the order given"""
+    self._load_user_file()
+
+    return [self.tools[name]() for name in names]
+
   def run_hook(self, name: str, request: str) -> None:
     self._load_user_file()
 
@@ -425,16 +461,65 @@ class Spackle:
   #############
   # UTILITIES #
   #############
-  def _log_copy_action(self, dest: str, force: bool, flag: str):
-    install = InstallPaths()
+  def _scan_names(self, directory: str) -> set:
+    """Materialize a directory's entries in one scandir so membership checks
+    replace per-file stat calls"""
+    try:
+      return {entry.name for entry in os.scandir(directory)}
+    except OSError:
+      return set()
+
+  def _plan_copies(self, install: InstallPaths) -> List[CopyOp]:
+    return [
+      # .claude/commands
+      Spackle.CopyOp(self.paths.prompts, install.prompts, tree=True),
+      # .spackle/spackle.*
+      Spackle.CopyOp(
+        self.paths.user_md, install.user_md, log=True, flag='--overwrite-spackle'
+      ),
+      Spackle.CopyOp(
+        self.paths.user_py, install.user_py, log=True, flag='--overwrite-spackle'
+      ),
+    ]
+
+  def _execute_copies(self, ops: List[CopyOp], install: InstallPaths) -> None:
+    inventory = {}
+    for op in ops:
+      parent = os.path.dirname(op.dest)
+      if parent not in inventory:
+        inventory[parent] = self._scan_names(parent)
+
+    for op in ops:
+      exists = os.path.basename(op.dest) in inventory[os.path.dirname(op.dest)]
+      copy = self._copy_tree if op.tree else self._copy_file
+      copy(
+        op.source,
+        op.dest,
+        force=op.force,
+        log=op.log,
+        flag=op.flag,
+        exists=exists,
+        install=install,
+      )
+
+  def _log_copy_action(
+    self,
+    dest: str,
+    force: bool,
+    flag: str,
+    exists: bool = None,
+    install: InstallPaths = None,
+  ):
+    install = install or InstallPaths()
 
     # Add a colored source and destination
-    message = self._color(
-      pathlib.Path(dest).relative_to(pathlib.Path(install.root)), self.colors.item
-    )
+    message = self._color(os.path.relpath(dest, install.root), self.colors.item)
+
+    if exists is None:
+      exists = _exists(dest)
 
     # Show whether overwrite was used
-    if os.path.exists(dest):
+    if exists:
       if force:
         message += f' ({self._color(flag, self.colors.shell)}; overwriting)'
       else:
@@ -443,32 +528,54 @@ class Spackle:
     print(message)
 
   def _copy_tree(
-    self, source, dest, force: bool = False, log: bool = False, flag: str = None
+    self,
+    source,
+    dest,
+    force: bool = False,
+    log: bool = False,
+    flag: str = None,
+    exists: bool = None,
+    install: InstallPaths = None,
   ):
+    if exists is None:
+      exists = _exists(dest)
+
     if log:
-      self._log_copy_action(dest, force, flag)
+      self._log_copy_action(dest, force, flag, exists=exists, install=install)
 
-    if os.path.exists(dest):
+    if exists:
       if force:
         shutil.rmtree(dest)
       else:
         return
 
-    shutil.copytree(source, dest)
+    shutil.copytree(source, dest, copy_function=shutil.copyfile)
 
   def _copy_file(
-    self, source, dest, force: bool = False, log: bool = False, flag: str = None
+    self,
+    source,
+    dest,
+    force: bool = False,
+    log: bool = False,
+    flag: str = None,
+    exists: bool = None,
+    install: InstallPaths = None,
   ):
+    if exists is None:
+      exists = _exists(dest)
+
     if log:
-      self._log_copy_action(dest, force, flag)
+      self._log_copy_action(dest, force, flag, exists=exists, install=install)
 
-    if os.path.exists(dest):
+    if exists:
       if force:
         os.remove(dest)
       else:
         return
 
-    shutil.copy2(source, dest)
+    # copyfile stays in-kernel on Linux (copy_file_range/sendfile) and skips
+    # copy2's extra copystat syscalls; these are config files, mtime is noise
+    shutil.copyfile(source, dest)
 
   def _copy_dir_file(
     self,
@@ -487,35 +594,40 @@ class Spackle:
     return f'{color}{text}{colorama.Style.RESET_ALL}'
 
   def _build_hooks(self) -> Dict:
-    hooks = {}
+    # Index entries by (event, matcher) so each hook is one dict hit instead
+    # of a linear scan over the event's entries
+    index = {}
     for hook in self.hooks.values():
-      entry = self._ensure_hook(hooks, hook)
+      entry = index.setdefault(
+        (hook.event_value, hook.matcher), {'matcher': hook.matcher, 'hooks': []}
+      )
       entry['hooks'].append({'type': 'command', 'command': f'spackle hook {hook.name}'})
 
-    return hooks
-
-  def _ensure_hook(self, hooks, hook: Hook) -> Dict:
-    if hook.event.value not in hooks:
-      hooks[hook.event.value] = []
-
-    matcher = '|'.join(tool.value for tool in hook.tools)
-
-    for entry in hooks[hook.event.value]:
-      if entry['matcher'] == matcher:
-        return entry
+    hooks = {}
+    for (event, _), entry in index.items():
+      hooks.setdefault(event, []).append(entry)
 
-    hooks[hook.event.value].append({'matcher': matcher, 'hooks': []})
-    return hooks[hook.event.value][-1]
+    return hooks
 
   def _load_user_file(self) -> bool:
     install = InstallPaths()
-    module_name = 'spackle_user"'
+    module_name = 'spackle_user'
 
     try:
-      spec = importlib.util.spec_from_file_location(module_name, install.user_py)
+      # Cache the compiled code object so repeat loads skip parse + compile
+      st = os.stat(install.user_py)
+      key = (install.user_py, st.st_mtime_ns)
+      code = _user_code_cache.get(key)
+      if code is None:
+        with open(install.user_py, 'rb') as file:
+          code = compile(file.read(), install.user_py, 'exec')
+        _user_code_cache[key] = code
+
+      spec = importlib.util.spec_from_loader(module_name, loader=None, origin=install.user_py)
       module = importlib.util.module_from_spec(spec)
+      module.__file__ = install.user_py
       sys.modules[module_name] = module
-      spec.loader.exec_module(module)
+      exec(code, module.__dict__)
     except Exception as e:
       print(e, file=sys.stderr)
       exit(1)
@@ -523,10 +635,14 @@ class Spackle:
     return True
 
   def _canonicalize_path(self, path: str) -> str:
-    return pathlib.Path(path).resolve()
+    return _realpath(path)
 
   def _is_file_path_within(self, file_path: str, directory: str) -> bool:
-    return os.path.commonpath([directory, file_path]) == directory
+    # A normalized-prefix check; os.path.commonpath splits both paths and
+    # compares per-component, which is overkill for a containment test
+    d = os.path.normpath(directory)
+    f = os.path.normpath(file_path)
+    return f == d or f.startswith(d + os.sep)
 
   def _is_file_path_equal(self, a: str, b: str) -> bool:
     return self._canonicalize_path(a) == self._canonicalize_path(b)
@@ -534,25 +650,32 @@ class Spackle:
   def _remove_dir_except_files(self, dir_path, keep_files):
     dir_path = pathlib.Path(dir_path)
 
-    # Save files that exist
-    saved_files = {}
-    for filename in keep_files:
-      file_path = dir_path / filename
-      if file_path.exists():
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-          tmp_path = pathlib.Path(tmp.name)
-        shutil.copy2(file_path, tmp_path)  # preserves metadata
-        saved_files[filename] = tmp_path
-
-    # Nuke the directory
-    shutil.rmtree(dir_path)
-
-    # Restore saved files
-    if saved_files:
-      dir_path.mkdir(parents=True, exist_ok=True)
-      for filename, tmp_path in saved_files.items():
-        shutil.copy2(tmp_path, dir_path / filename)
-        tmp_path.unlink()
+    # Stash kept files in a sibling directory; a same-filesystem rename is a
+    # metadata-only move, so no file bytes pass through userspace. mkdtemp
+    # picks a fresh name, so a stale stash from a crashed run is left alone
+    stash = pathlib.Path(
+      tempfile.mkdtemp(dir=dir_path.parent, prefix='.spackle-stash-')
+    )
+
+    try:
+      for filename in keep_files:
+        file_path = dir_path / filename
+        if file_path.exists():
+          os.rename(file_path, stash / file_path.name)
+
+      # Nuke the directory
+      shutil.rmtree(dir_path)
+    finally:
+      # Restore saved files; running this on the error path too means a
+      # failed rmtree puts the kept files back instead of losing them with
+      # the stash. rmdir (not rmtree) so a stash that somehow still holds
+      # files is never deleted
+      saved_files = os.listdir(stash)
+      if saved_files:
+        dir_path.mkdir(parents=True, exist_ok=True)
+        for filename in saved_files:
+          os.rename(stash / filename, dir_path / filename)
+      os.rmdir(stash)
 
   def _create_vendor_symlinks(self, install: InstallPaths) -> None:
     """Create symlink to cached repositories in .spackle/repos/"""
@@ -566,7 +689,7 @@ class Spackle:
       return
 
     # Remove existing repos symlink if it exists
-    if os.path.exists(repos_symlink) or os.path.islink(repos_symlink):
+    if _exists(repos_symlink) or os.path.islink(repos_symlink):
       if os.path.islink(repos_symlink):
         os.unlink(repos_symlink)
       else:
@@ -579,33 +702,48 @@ class Spackle:
       f'Created repos symlink: {self._color("repos/", self.colors.item)} -> {repo_config.cache_dir}'
     )
 
-  def _update_claude_md(self, claude_md_path: str) -> None:
+  def _update_claude_md(self, claude_md_path: str, exists: bool = None) -> None:
     """Update CLAUDE.md non-destructively by adding spackle reference if not present"""
-    self._log_copy_action(claude_md_path, force=False, flag='(non-destructive update)')
-
-    spackle_reference = '@.spackle/prompts/spackle.md'
+    if exists is None:
+      exists = _exists(claude_md_path)
 
-    if os.path.exists(claude_md_path):
-      # Non-destructive mode - check if reference exists
-      with open(claude_md_path, 'r') as f:
-        lines = [line.rstrip('\n') for line in f]
+    self._log_copy_action(
+      claude_md_path, force=False, flag='(non-destructive update)', exists=exists
+    )
 
-      # Check if our reference already exists
-      reference_exists = any(spackle_reference in line for line in lines)
+    spackle_reference = '@.spackle/prompts/spackle.md'
 
-      if not reference_exists:
-        # Add our reference
-        lines.append(spackle_reference)
-        with open(claude_md_path, 'w') as f:
-          f.write('\n'.join(lines) + '\n')
+    if exists:
+      # Single r+ pass: stop scanning at the first hit, append at EOF on a miss
+      with open(claude_md_path, 'r+') as f:
+        found = False
+        last = '\n'
+        while True:
+          line = f.readline()
+          if not line:
+            break
+          last = line
+          if spackle_reference in line:
+            found = True
+            break
+
+        if not found:
+          if not last.endswith('\n'):
+            f.write('\n')
+          f.write(f'{spackle_reference}\n')
     else:
       # File doesn't exist - create it with our reference
       with open(claude_md_path, 'w') as f:
         f.write(f'{spackle_reference}\n')
 
-  def _update_mcp_config(self, mcp_config_path: str) -> None:
+  def _update_mcp_config(self, mcp_config_path: str, exists: bool = None) -> None:
     """Update .mcp.json non-destructively by adding spackle servers if not present"""
-    self._log_copy_action(mcp_config_path, force=False, flag='(non-destructive update)')
+    if exists is None:
+      exists = _exists(mcp_config_path)
+
+    self._log_copy_action(
+      mcp_config_path, force=False, flag='(non-destructive update)', exists=exists
+    )
 
     spackle_servers = {
       'spackle-main': {'command': 'spackle', 'args': ['serve', 'main']},
@@ -613,76 +751,132 @@ class Spackle:
       'spackle-sqlite': {'command': 'spackle', 'args': ['serve', 'sqlite']},
     }
 
-    if os.path.exists(mcp_config_path):
+    if exists:
       # Non-destructive mode - merge servers
-      with open(mcp_config_path, 'r') as f:
+      with open(mcp_config_path, 'rb') as f:
         try:
-          config = json.load(f)
-        except json.JSONDecodeError:
+          config = _json_loads(f.read())
+        except ValueError:
           config = {}
 
       if 'mcpServers' not in config:
         config['mcpServers'] = {}
 
-      # Add spackle servers (don't remove existing ones)
+      # Add spackle servers (don't remove existing ones); only rewrite the
+      # file when the merge actually changed something
+      dirty = False
       for server_name, server_config in spackle_servers.items():
-        config['mcpServers'][server_name] = server_config
+        if config['mcpServers'].get(server_name) != server_config:
+          config['mcpServers'][server_name] = server_config
+          dirty = True
+
+      if not dirty:
+        return
 
-      with open(mcp_config_path, 'w') as f:
-        json.dump(config, f, indent=2)
+      with open(mcp_config_path, 'wb') as f:
+        f.write(_json_dumps(config))
     else:
       # File doesn't exist - create it with our servers
       config = {'mcpServers': spackle_servers}
-      with open(mcp_config_path, 'w') as f:
-        json.dump(config, f, indent=2)
+      with open(mcp_config_path, 'wb') as f:
+        f.write(_json_dumps(config))
 
   def _clean_claude_md(self, claude_md_path: str) -> None:
     """Remove spackle reference from CLAUDE.md"""
     spackle_reference = '@.spackle/prompts/spackle.md'
 
-    with open(claude_md_path, 'r') as f:
-      lines = [line.rstrip('\n') for line in f]
+    with open(claude_md_path, 'r+') as f:
+      # Cheap short-circuiting scan first; only materialize and rewrite on a hit
+      found = False
+      while True:
+        line = f.readline()
+        if not line:
+          break
+        if spackle_reference in line:
+          found = True
+          break
+
+      if not found:
+        return
 
-    # Remove lines containing our reference
-    cleaned_lines = [line for line in lines if spackle_reference not in line]
+      f.seek(0)
+      lines = [line.rstrip('\n') for line in f]
+      cleaned_lines = [line for line in lines if spackle_reference not in line]
 
-    if len(cleaned_lines) != len(lines):
-      # Only rewrite if we removed something
       if cleaned_lines:
-        with open(claude_md_path, 'w') as f:
-          f.write('\n'.join(cleaned_lines) + '\n')
-      else:
-        # File would be empty, remove it
-        os.remove(claude_md_path)
+        f.seek(0)
+        f.truncate()
+        f.write('\n'.join(cleaned_lines) + '\n')
+        return
+
+    # File would be empty, remove it
+    os.remove(claude_md_path)
 
   def _clean_mcp_config(self, mcp_config_path: str) -> None:
     """Remove spackle servers from .mcp.json"""
     spackle_server_names = ['spackle-main', 'spackle-probe', 'spackle-sqlite']
 
-    with open(mcp_config_path, 'r') as f:
+    with open(mcp_config_path, 'rb') as f:
       try:
-        config = json.load(f)
-      except json.JSONDecodeError:
+        config = _json_loads(f.read())
+      except ValueError:
         return
 
+    removed = False
     if 'mcpServers' in config:
       # Remove spackle servers
       for server_name in spackle_server_names:
-        config['mcpServers'].pop(server_name, None)
+        if config['mcpServers'].pop(server_name, None) is not None:
+          removed = True
 
       # If mcpServers is now empty, remove it
       if not config['mcpServers']:
         del config['mcpServers']
+        removed = True
+
+    # Nothing of ours was present; don't rewrite an unchanged file
+    if not removed:
+      return
 
     # If config is now empty, remove the file
     if not config:
       os.remove(mcp_config_path)
     else:
-      with open(mcp_config_path, 'w') as f:
-        json.dump(config, f, indent=2)
+      with open(mcp_config_path, 'wb') as f:
+        f.write(_json_dumps(config))
+
+
+class _LazySpackle:
+  """Proxy that defers Spackle construction (colorama init, filesystem walks)
+  until the singleton is actually used, so commands like --help pay nothing"""
+
+  _instance: Optional[Spackle] = None
+
+  def _materialize(self) -> Spackle:
+    if _LazySpackle._instance is None:
+      _LazySpackle._instance = Spackle()
+      _register_builtins()
+    return _LazySpackle._instance
+
+  def __getattr__(self, name):
+    return getattr(self._materialize(), name)
+
 
+spackle = _LazySpackle()
 
-spackle = Spackle()
+
+def __getattr__(name):
+  # PEP 562: the subservers pull in fastmcp and friends, so their imports only
+  # happen when someone actually asks for them
+  if name == 'sqlite_server':
+    from .sqlite import sqlite_server
+
+    return sqlite_server
+  if name == 'probe_server':
+    from .probe import probe_server
+
+    return probe_server
+  raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 ###########
@@ -700,14 +894,36 @@ def wsl_to_windows(wsl_path: str) -> str:
   return result.stdout.strip()
 
 
-tool = spackle.tool
-hook = spackle.hook
-mcp = spackle.mcp
-load = spackle.load
-prompt = spackle.prompt
-prompt_file = spackle.prompt_file
-wrap_subprocess = spackle.wrap_subprocess
-configure = spackle.configure
+def tool(fn: Callable) -> Callable:
+  return spackle.tool(fn)
+
+
+def hook(event: HookEvent, tools: Optional[List[HookTool]] = None) -> Callable:
+  return spackle.hook(event, tools)
+
+
+def mcp(name: str) -> Callable:
+  return spackle.mcp(name)
+
+
+def load(fn: Callable) -> Callable:
+  return spackle.load(fn)
+
+
+def prompt(fn: Callable) -> Callable:
+  return spackle.prompt(fn)
+
+
+def prompt_file(fn: Callable) -> Callable:
+  return spackle.prompt_file(fn)
+
+
+def wrap_subprocess(*args, **kwargs):
+  return spackle.wrap_subprocess(*args, **kwargs)
+
+
+def configure(config: Config):
+  return spackle.configure(config)
 
 
 #################
@@ -715,8 +931,9 @@ configure = spackle.configure
 #################
 class SpackleMcps:
   @staticmethod
-  @spackle.mcp(name='main')
   def main():
+    import fastmcp
+
     mcp = fastmcp.FastMCP('spackle-main', on_duplicate_tools='replace')
     for name, fn in spackle.tools.items():
       print(name)
@@ -725,30 +942,23 @@ class SpackleMcps:
     mcp.run()
 
   @staticmethod
-  @spackle.mcp(name='probe')
   def probe():
     from .probe import probe_server
 
     probe_server()
 
 
-from .sqlite import sqlite_server
-
-
 ####################
 # BUILT IN PROMPTS #
 ####################
-@spackle.prompt_file
 def sp_refresh_instructions():
   return spackle.install.prompts + '/refresh-instructions.md'
 
 
-@spackle.prompt_file
 def sp_refresh_user_instructions():
   return spackle.install.prompts + '/refresh-user-instructions.md'
 
 
-@spackle.prompt_file
 def spackle__sketch():
   return spackle.paths.prompts + '/sketch.md'
 
@@ -756,19 +966,14 @@ def spackle__sketch():
 ##################
 # BUILT IN HOOKS #
 ##################
-@spackle.hook(
-  event=HookEvent.PreToolUse, tools=[HookTool.Edit, HookTool.MultiEdit, HookTool.Write]
-)
 def sp_refresh_write(context: HookContext):
   context.allow_with_prompt('refresh-write.md')
 
 
-@spackle.hook(event=HookEvent.Stop)
 def sp_ensure_build_passes(context: HookContext):
   context.allow_with_prompt('ensure-build-passes.md')
 
 
-@spackle.hook(event=HookEvent.PreToolUse, tools=[HookTool.Bash])
 def sp_ensure_correct_build(context: HookContext):
   if spackle.blacklist:
     context.deny_blacklist(spackle.blacklist, 'use the spackle mcp goddamnit')
@@ -778,7 +983,6 @@ def sp_ensure_correct_build(context: HookContext):
 ##################
 # BUILT IN TOOLS #
 ##################
-@spackle.tool
 def build() -> McpResult:
   """Build the project"""
   return McpResult(
@@ -789,7 +993,6 @@ def build() -> McpResult:
   )
 
 
-@spackle.tool
 def run() -> McpResult:
   """Run the project"""
   return McpResult(
@@ -800,7 +1003,6 @@ def run() -> McpResult:
   )
 
 
-@spackle.tool
 def test() -> McpResult:
   """Run tests"""
   return McpResult(
@@ -811,6 +1013,71 @@ def test() -> McpResult:
   )
 
 
+def _register_mcp_builtins():
+  # Registering the sqlite MCP happens as a side effect of importing the module
+  from . import sqlite  # noqa: F401
+
+  spackle.mcp(name='main')(SpackleMcps.main)
+  spackle.mcp(name='probe')(SpackleMcps.probe)
+
+
+def _register_prompt_builtins():
+  spackle.prompt_file(sp_refresh_instructions)
+  spackle.prompt_file(sp_refresh_user_instructions)
+  spackle.prompt_file(spackle__sketch)
+
+
+def _register_hook_builtins():
+  spackle.hook(
+    event=HookEvent.PreToolUse,
+    tools=[HookTool.Edit, HookTool.MultiEdit, HookTool.Write],
+  )(sp_refresh_write)
+  spackle.hook(event=HookEvent.Stop)(sp_ensure_build_passes)
+  spackle.hook(event=HookEvent.PreToolUse, tools=[HookTool.Bash])(
+    sp_ensure_correct_build
+  )
+
+
+def _register_tool_builtins():
+  spackle.tool(build)
+  spackle.tool(run)
+  spackle.tool(test)
+
+
+_ALL_BUILTIN_REGISTRARS = (
+  _register_mcp_builtins,
+  _register_prompt_builtins,
+  _register_hook_builtins,
+  _register_tool_builtins,
+)
+
+# Which builtins each subcommand can actually reach; anything not listed
+# (build, library use, tests) registers everything
+_SUBCOMMAND_BUILTINS = {
+  'clean': (),
+  'debug': (),
+  'jira': (),
+  'repo': (),
+  'hook': (_register_hook_builtins,),
+  'tool': (_register_tool_builtins,),
+  'serve': (_register_mcp_builtins, _register_tool_builtins),
+}
+
+_builtin_registrars = _ALL_BUILTIN_REGISTRARS
+
+
+def _select_builtins(argv: List[str]) -> None:
+  """Narrow builtin registration to what the invoked subcommand needs"""
+  global _builtin_registrars
+  if argv and argv[0] in _SUBCOMMAND_BUILTINS:
+    _builtin_registrars = _SUBCOMMAND_BUILTINS[argv[0]]
+
+
+def _register_builtins():
+  for registrar in _builtin_registrars:
+    registrar()
+
+
 #######
 # CLI #
 #######
@@ -836,10 +1103,14 @@ class CLI:
 
   @staticmethod
   @click.command()
-  @click.argument('name')
-  def tool(name):
-    """Run a tool defined in the main spackle MCP with @spackle.tool"""
-    spackle.run_tool(name)
+  @click.argument('names', nargs=-1, required=True)
+  def tool(names):
+    """Run tools defined in the main spackle MCP with @spackle.tool
+
+    Several names may be given; they share one invocation instead of paying
+    interpreter startup per tool.
+    """
+    spackle.run_tools(list(names))
 
   @staticmethod
   @click.command()
@@ -869,6 +1140,8 @@ class CLI:
   @click.argument('url', required=False, default='https://httpbin.org/get')
   def debug(url):
     """Debug command to test HTTP requests"""
+    import requests
+
     try:
       print(f'Making request to: {url}')
       response = requests.get(url, timeout=10)
@@ -914,6 +1187,13 @@ class CLI:
     if not config.remove_repository(name):
       sys.exit(1)
 
+  @staticmethod
+  @click.command()
+  def update():
+    """Update all managed repositories"""
+    config = RepoConfig()
+    config.update_all()
+
   @staticmethod
   @click.command('list')
   def list_repos():
@@ -949,6 +1229,9 @@ class CLI:
     - A Jira URL (browse or XML format)
     - If omitted, reads from stdin
     """
+    import requests
+
+    from .jira import parse_jira_to_markdown, fetch_jira_xml_from_url
 
     xml_content = None
 
@@ -1020,11 +1303,21 @@ cli.add_command(CLI.repo)
 # Register repo subcommands
 CLI.repo.add_command(CLI.add)
 CLI.repo.add_command(CLI.remove)
+CLI.repo.add_command(CLI.update)
 CLI.repo.add_command(CLI.list_repos)
 
 
 ########
 # MAIN #
 ########
-def main():
-  cli()
+def main(argv=None) -> int:
+  """CLI entrypoint. Passing argv runs the command in-process and returns an
+  exit code instead of exiting, so tests can drive commands through argv
+  parsing without spawning an interpreter"""
+  if argv is None:
+    _select_builtins(sys.argv[1:])
+    cli()
+    return 0
+
+  _select_builtins(argv)
+  return cli.main(args=argv, standalone_mode=False) or 0
@@ -1,3 +1,7 @@
+import concurrent.futures
+import copy
+import functools
+import io
 import re
 import urllib.parse
 from dataclasses import dataclass, field
@@ -7,22 +11,60 @@ from lxml import etree
 from lxml.html import fromstring, tostring
 import requests
 
-
-@dataclass
+# selectolax parses small HTML fragments several times faster than lxml; it's
+# optional, and strip_html falls back to the lxml path when it's absent
+try:
+  from selectolax.parser import HTMLParser as _FastHTMLParser
+except ImportError:
+  _FastHTMLParser = None
+
+
+# Compile the hot-path patterns once; re's internal cache is bounded and a
+# large ticket runs these against every comment and description fragment
+_RE_DOUBLE_NL = re.compile(r'\n\s*\n')
+_RE_TRIPLE_NL = re.compile(r'\n\s*\n\s*\n+')
+_RE_SPACES = re.compile(r' +')
+_RE_DASH = re.compile(r'\n--([^\-])')
+_RE_DASH_START = re.compile(r'^--([^\-])')
+_RE_TITLE_KEY = re.compile(r'\[([A-Z]+-\d+)\]')
+_RE_DUP_REL = re.compile(r'(<a[^>]*?)rel="([^"]+)"([^>]*?)rel="([^"]+)"')
+
+
+# Tag sets for _extract_fragments dispatch: set membership per node instead of
+# chained list scans
+_BLOCK_TAGS = frozenset({'p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+_LIST_TAGS = frozenset({'ul', 'ol'})
+_HANDLED_TAGS = _BLOCK_TAGS | _LIST_TAGS | {'li', 'br'}
+
+
+# One pooled session for every fetch: keep-alive across tickets instead of a
+# fresh TCP + TLS handshake per request
+_SESSION = requests.Session()
+_SESSION.mount(
+  'https://',
+  requests.adapters.HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=requests.adapters.Retry(total=3, backoff_factor=0.2),
+  ),
+)
+
+
+@dataclass(slots=True)
 class JiraProject:
   name: str
   id: str
   key: str
 
 
-@dataclass
+@dataclass(slots=True)
 class JiraComment:
   author: str
   created: str
   text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class JiraTicket:
   # Core fields
   key: str
@@ -88,32 +130,95 @@ class MarkdownFormatter:
       self.lines.append(content)
       self.lines.append('')
 
-  def add_bullet_list(self, items: List[tuple[str, Any]]) -> None:
+  def add_bullet_list(self, items) -> None:
+    """Accepts a dict or an iterable of (key, value) pairs"""
+    if isinstance(items, dict):
+      items = items.items()
     for key, value in items:
-      if isinstance(value, list):
-        value = ', '.join(str(v) for v in value)
+      # Scalar strings are the common case; check them before the list branch
+      if not isinstance(value, str) and isinstance(value, list):
+        value = ', '.join(map(str, value))
       self.lines.append(f'- **{key}:** {value}')
 
   def get_markdown(self) -> str:
-    result = []
-    for i, line in enumerate(self.lines):
-      result.append(line)
-      # Add double newline after non-empty lines that aren't followed by empty lines
-      if (
-        line
-        and i < len(self.lines) - 1
-        and self.lines[i + 1]
-        and not line.startswith('- ')
-        and not self.lines[i + 1].startswith('- ')
-      ):
-        result.append('')
-    return '\n'.join(result)
+    # Single pass: each line's bullet-ness is computed once and the separator
+    # is chosen from the previous line instead of a look-ahead, joined directly
+    # with newline tokens rather than through an intermediate list of blanks
+    pieces = []
+    prev = ''
+    prev_bullet = False
+    for line in self.lines:
+      bullet = line.startswith('- ')
+      if pieces:
+        # Double newline between adjacent non-empty, non-bullet lines
+        if prev and line and not prev_bullet and not bullet:
+          pieces.append('\n\n')
+        else:
+          pieces.append('\n')
+      pieces.append(line)
+      prev = line
+      prev_bullet = bullet
+    return ''.join(pieces)
+
+
+def _fast_strip_html(html: str) -> str:
+  """Strip tags in one scan for the malformed-HTML fallback, converting <br>
+  variants and </p> to newlines as they're encountered instead of running a
+  separate full-string regex pass per pattern"""
+  out = []
+  i = 0
+  n = len(html)
+  while i < n:
+    ch = html[i]
+    if ch == '<':
+      end = html.find('>', i + 1)
+      if end != -1:
+        tag = html[i + 1 : end].lower()
+        if tag == '/p':
+          out.append('\n\n')
+        elif tag.rstrip('/').rstrip() == 'br':
+          out.append('\n')
+        i = end + 1
+        continue
+      # No closing '>': the regex fallback kept this text, so keep it too
+    out.append(ch)
+    i += 1
+  return ''.join(out)
 
 
 def strip_html(html_text: str) -> str:
   if not html_text:
     return ''
 
+  # Plain text is the common case for custom-field values; two memchr scans
+  # decide whether a parse is needed at all. '&' still routes through the
+  # parser so entities get decoded
+  if '<' not in html_text and '&' not in html_text:
+    text = _RE_DOUBLE_NL.sub('\n\n', html_text)
+    return _RE_SPACES.sub(' ', text).strip()
+
+  if _FastHTMLParser is not None:
+    try:
+      tree = _FastHTMLParser(html_text)
+
+      # Convert br and p tags to newlines, with the same placement as the
+      # lxml path below: one newline before each paragraph's text and one
+      # after (where lxml prefixes the tail), never a double
+      for br in tree.css('br'):
+        br.replace_with('\n')
+      for p in tree.css('p'):
+        p.replace_with('\n' + (p.text() or '') + '\n')
+
+      text = tree.text()
+
+      # Clean up excessive whitespace
+      text = _RE_DOUBLE_NL.sub('\n\n', text)
+      text = _RE_SPACES.sub(' ', text)
+
+      return text.strip()
+    except Exception:
+      pass  # Fall through to the lxml path
+
   try:
     # Parse HTML
     doc = fromstring(html_text)
@@ -130,17 +235,15 @@ def strip_html(html_text: str) -> str:
     text = doc.text_content()
 
     # Clean up excessive whitespace
-    text = re.sub(r'\n\s*\n', '\n\n', text)
-    text = re.sub(r' +', ' ', text)
+    text = _RE_DOUBLE_NL.sub('\n\n', text)
+    text = _RE_SPACES.sub(' ', text)
 
     return text.strip()
   except Exception:
-    # Fallback to simple regex if lxml fails
-    text = re.sub(r'<br\s*/?>', '\n', html_text)
-    text = re.sub(r'</p>', '\n\n', text)
-    text = re.sub(r'<[^>]+>', '', text)
-    text = re.sub(r'\n\s*\n', '\n\n', text)
-    text = re.sub(r' +', ' ', text)
+    # Fallback to a single tag-stripping scan if lxml fails
+    text = _fast_strip_html(html_text)
+    text = _RE_DOUBLE_NL.sub('\n\n', text)
+    text = _RE_SPACES.sub(' ', text)
     return text.strip()
 
 
@@ -150,15 +253,16 @@ def preprocess_jira_xml(xml_content: str) -> str:
   if first_bracket > 0:
     xml_content = xml_content[first_bracket:]
 
-  # Replace unescaped ampersands in text (not URL params or entities)
-  xml_content = xml_content.replace(' & ', ' ')
-
-  # Fix duplicate rel attributes in anchor tags
-  # Pattern: rel="value1" ... rel="value2" -> rel="value1 value2"
-  import re
+  # Cheap presence probes before the full-string rewrites; well-formed Jira
+  # Cloud exports need neither fix, so the common path is two scans and no copy
+  if ' & ' in xml_content:
+    # Replace unescaped ampersands in text (not URL params or entities)
+    xml_content = xml_content.replace(' & ', ' ')
 
-  pattern = r'(<a[^>]*?)rel="([^"]+)"([^>]*?)rel="([^"]+)"'
-  xml_content = re.sub(pattern, r'\1rel="\2 \4"\3', xml_content)
+  if 'rel=' in xml_content:
+    # Fix duplicate rel attributes in anchor tags
+    # Pattern: rel="value1" ... rel="value2" -> rel="value1 value2"
+    xml_content = _RE_DUP_REL.sub(r'\1rel="\2 \4"\3', xml_content)
 
   return xml_content
 
@@ -168,87 +272,157 @@ def get_text(parent, tag: str) -> Optional[str]:
   return elem.text if elem is not None and elem.text else None
 
 
-def extract_all_text(element) -> str:
-  if element is None:
-    return ''
+def _collect_fragments(element) -> str:
+  """Materialize one subtree's text when a handler needs it as a unit"""
+  fragments = []
+  _extract_fragments(element, fragments)
+  return ''.join(fragments).strip()
 
-  texts = []
 
+def _extract_fragments(element, out: List[str]) -> None:
+  """Append text fragments into a shared list so the tree joins exactly once"""
   # Get direct text content
   if element.text:
-    texts.append(element.text.strip())
+    out.append(element.text.strip())
 
-  # Recursively get text from all children
   for child in element:
+    tag = child.tag
+    if tag not in _HANDLED_TAGS:
+      # Jira emits lowercase tags; only the odd ones out pay for .lower()
+      tag = tag.lower()
+
     # Handle different HTML elements for proper markdown formatting
-    if child.tag.lower() in ['p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+    if tag in _BLOCK_TAGS:
       # Paragraph-like elements get double newlines
-      child_text = extract_all_text(child)
+      child_text = _collect_fragments(child)
       if child_text:
-        texts.append('\n' + child_text + '\n')
-    elif child.tag.lower() in ['li']:
+        out.append('\n' + child_text + '\n')
+    elif tag == 'li':
       # List items get bullet points - handle br tags within li as newlines
-      child_text = extract_all_text(child)
+      child_text = _collect_fragments(child)
       if child_text:
         # Split on newlines and make each a separate list item
-        lines = [line.strip() for line in child_text.split('\n') if line.strip()]
-        for line in lines:
-          texts.append('\n- ' + line)
-    elif child.tag.lower() in ['ul', 'ol']:
-      # Lists - just process children
-      child_text = extract_all_text(child)
-      if child_text:
-        texts.append(child_text)
-    elif child.tag.lower() in ['br']:
+        for line in child_text.split('\n'):
+          line = line.strip()
+          if line:
+            out.append('\n- ' + line)
+    elif tag in _LIST_TAGS:
+      # Lists get collected and stripped as a unit, like the old recursion
+      # did; inlining them unstripped would leak a leading newline and insert
+      # a blank line between a paragraph and the list that follows it
+      out.append(_collect_fragments(child))
+    elif tag == 'br':
       # Line breaks
-      texts.append('\n')
+      out.append('\n')
     else:
       # Other elements just get their text
-      child_text = extract_all_text(child)
-      if child_text:
-        texts.append(child_text)
+      _extract_fragments(child, out)
 
     # Get tail text (text after closing tag)
     if child.tail and child.tail.strip():
-      texts.append(child.tail.strip())
+      out.append(child.tail.strip())
+
+
+def extract_all_text(element) -> str:
+  if element is None:
+    return ''
+
+  texts = []
+  _extract_fragments(element, texts)
 
   # Join and clean up excessive whitespace
   result = ''.join(texts)
   # Replace multiple newlines with double newlines for proper paragraph spacing
-  result = re.sub(r'\n\s*\n\s*\n+', '\n\n', result)
+  result = _RE_TRIPLE_NL.sub('\n\n', result)
   # Fix double dashes at start of lines to be proper list items
-  result = re.sub(r'\n--([^\-])', r'\n- \1', result)
-  result = re.sub(r'^--([^\-])', r'- \1', result)
+  result = _RE_DASH.sub(r'\n- \1', result)
+  result = _RE_DASH_START.sub(r'- \1', result)
   return result.strip()
 
 
-def parse_jira_xml(xml_content: str) -> Optional[JiraTicket]:
-  try:
-    # Preprocess the XML to fix Jira's invalid XML
-    xml_content = preprocess_jira_xml(xml_content)
+def parse_jira_xml(xml_content: 'str | bytes') -> Optional[JiraTicket]:
+  # Re-fetching the same ticket hands identical XML back in; tickets are
+  # mutable, so the cache keeps a pristine parse and each caller gets a copy
+  return copy.deepcopy(_parse_jira_xml_cached(xml_content))
 
-    root = etree.fromstring(xml_content.encode('utf-8'))
-  except Exception as e:
+
+@functools.lru_cache(maxsize=32)
+def _parse_jira_xml_cached(xml_content: 'str | bytes') -> Optional[JiraTicket]:
+  # Callers holding a raw response body can pass bytes directly; one decode is
+  # still needed for the string-level preprocess fixups
+  if isinstance(xml_content, bytes):
+    xml_content = xml_content.decode('utf-8')
+
+  # Preprocess the XML to fix Jira's invalid XML
+  xml_content = preprocess_jira_xml(xml_content)
+
+  # Stream the document and stop at the first item instead of building the
+  # full DOM; large exports with many comments never sit in memory whole.
+  # huge_tree lifts libxml2's depth/size guards, which oversized ticket
+  # descriptions can otherwise trip
+  ticket = None
+  try:
+    for _, item in etree.iterparse(
+      io.BytesIO(xml_content.encode('utf-8')),
+      events=('end',),
+      tag='item',
+      huge_tree=True,
+    ):
+      ticket = _ticket_from_item(item)
+
+      # Standard lxml streaming idiom: release the subtree and any already
+      # processed siblings before moving on
+      item.clear()
+      while item.getprevious() is not None:
+        del item.getparent()[0]
+      break
+  except etree.XMLSyntaxError as e:
     raise ValueError(f'Failed to parse XML: {str(e)}')
 
-  # Find the first item (ticket)
-  item = root.find('.//item')
-  if item is None:
+  if ticket is None:
     raise ValueError('No ticket found in XML')
 
+  return ticket
+
+
+def _ticket_from_item(item) -> JiraTicket:
+  # Index the item's children in one pass; every find/findall would otherwise
+  # rescan the child list, and the item has ~20 fields of interest
+  children = {}
+  components = []
+  labels_elem = None
+  comments_elem = None
+  customfields_elem = None
+  for child in item:
+    tag = child.tag
+    if tag == 'component':
+      components.append(child)
+    elif tag == 'labels':
+      labels_elem = child
+    elif tag == 'comments':
+      comments_elem = child
+    elif tag == 'customfields':
+      customfields_elem = child
+    elif tag not in children:
+      children[tag] = child
+
+  def text(tag: str) -> Optional[str]:
+    elem = children.get(tag)
+    return elem.text if elem is not None and elem.text else None
+
   # Extract basic fields
-  title = get_text(item, 'title') or ''
-  link = get_text(item, 'link') or ''
+  title = text('title') or ''
+  link = text('link') or ''
 
   # Extract ticket key from title (e.g., [EFS-9211])
   key = ''
-  title_match = re.match(r'\[([A-Z]+-\d+)\]', title)
+  title_match = _RE_TITLE_KEY.match(title)
   if title_match:
     key = title_match.group(1)
 
   # Extract project info
   project = None
-  project_elem = item.find('project')
+  project_elem = children.get('project')
   if project_elem is not None:
     project = JiraProject(
       name=project_elem.text or '',
@@ -258,7 +432,7 @@ def parse_jira_xml(xml_content: str) -> Optional[JiraTicket]:
 
   # Extract and clean description
   description = ''
-  description_elem = item.find('description')
+  description_elem = children.get('description')
   if description_elem is not None:
     description = extract_all_text(description_elem)
 
@@ -266,64 +440,64 @@ def parse_jira_xml(xml_content: str) -> Optional[JiraTicket]:
   ticket = JiraTicket(
     key=key,
     title=title,
-    summary=get_text(item, 'summary') or '',
+    summary=text('summary') or '',
     description=description,
     link=link,
     project=project,
-    type=get_text(item, 'type'),
-    status=get_text(item, 'status'),
-    priority=get_text(item, 'priority'),
-    resolution=get_text(item, 'resolution'),
-    assignee=get_text(item, 'assignee'),
-    reporter=get_text(item, 'reporter'),
-    created=get_text(item, 'created'),
-    updated=get_text(item, 'updated'),
-    resolved=get_text(item, 'resolved'),
-    environment=get_text(item, 'environment'),
-    timespent=get_text(item, 'timespent'),
-    votes=get_text(item, 'votes'),
-    watches=get_text(item, 'watches'),
+    type=text('type'),
+    status=text('status'),
+    priority=text('priority'),
+    resolution=text('resolution'),
+    assignee=text('assignee'),
+    reporter=text('reporter'),
+    created=text('created'),
+    updated=text('updated'),
+    resolved=text('resolved'),
+    environment=text('environment'),
+    timespent=text('timespent'),
+    votes=text('votes'),
+    watches=text('watches'),
   )
 
   # Extract components
-  components = item.findall('component')
   if components:
     ticket.components = [comp.text for comp in components if comp.text]
 
   # Extract labels
-  labels = item.findall('labels/label')
-  if labels:
-    ticket.labels = [label.text for label in labels if label.text]
+  if labels_elem is not None:
+    ticket.labels = [
+      label.text for label in labels_elem if label.tag == 'label' and label.text
+    ]
 
-  # Extract custom fields
-  customfields_elem = item.find('customfields')
+  # Extract custom fields; iterchildren plus an inline child walk stays in C
+  # and skips the XPath evaluation find/findall would run per field
   if customfields_elem is not None:
-    for field in customfields_elem.findall('customfield'):
-      field_id = field.get('id', '')
-      field_key = field.get('key', '')
-      field_name_elem = field.find('customfieldname')
-      field_name = field_name_elem.text if field_name_elem is not None else field_id
-
-      # Extract field values
-      values_elem = field.find('customfieldvalues')
-      if values_elem is not None:
-        values = []
-        for value_elem in values_elem.findall('customfieldvalue'):
-          if value_elem.text:
-            values.append(strip_html(value_elem.text))
-
-        if values:
-          ticket.custom_fields[field_name] = values if len(values) > 1 else values[0]
+    for field_elem in customfields_elem.iterchildren('customfield'):
+      field_name = None
+      values = []
+      for sub in field_elem:
+        if sub.tag == 'customfieldname':
+          field_name = sub.text
+        elif sub.tag == 'customfieldvalues':
+          for value_elem in sub:
+            if value_elem.tag == 'customfieldvalue' and value_elem.text:
+              values.append(strip_html(value_elem.text))
+
+      if field_name is None:
+        field_name = field_elem.get('id', '')
+
+      if values:
+        ticket.custom_fields[field_name] = values if len(values) > 1 else values[0]
 
   # Extract comments
-  comments = item.findall('.//comment')
-  if comments:
-    for comment in comments:
-      comment_text = extract_all_text(comment) if comment is not None else ''
+  if comments_elem is not None:
+    for comment in comments_elem:
+      if comment.tag != 'comment':
+        continue
       comment_obj = JiraComment(
         author=comment.get('author', ''),
         created=comment.get('created', ''),
-        text=comment_text,
+        text=extract_all_text(comment),
       )
       ticket.comments.append(comment_obj)
 
@@ -398,7 +572,7 @@ def format_ticket_markdown(ticket: JiraTicket) -> str:
   # Custom fields
   if ticket.custom_fields:
     formatter.add_header('Custom Fields', 2)
-    formatter.add_bullet_list(list(ticket.custom_fields.items()))
+    formatter.add_bullet_list(ticket.custom_fields)
     formatter.add_line_break()
 
   # Comments
@@ -415,6 +589,7 @@ def format_ticket_markdown(ticket: JiraTicket) -> str:
   return formatter.get_markdown()
 
 
+@functools.lru_cache(maxsize=1024)
 def convert_jira_browse_url_to_xml(browse_url: str) -> str:
   parsed_url = urllib.parse.urlparse(browse_url)
 
@@ -432,51 +607,52 @@ def convert_jira_browse_url_to_xml(browse_url: str) -> str:
   return browse_url
 
 
-def fetch_jira_xml_from_url(url: str, timeout: int = 10) -> str:
-  jira_fields = [
-    # 'summary',
-    # 'issuetype',
-    # 'status',
-    # 'priority',
-    # 'description',
-    # 'created',
-    # 'updated',
-    # 'parent',
-    # 'subtasks',
-    # 'issuelinks'
-    'key',
-    'summary',
-    'description',
-    'comments',
-    'customfield',
-    'project',
-    'type',
-    'priority',
-    'status',
-    'resolution',
-    'assignee',
-    'reporter',
-    'created',
-    'updated',
-    'resolved',
-    'component',
-    'labels',
-    'environment',
-  ]
-
+jira_fields = (
+  # 'summary',
+  # 'issuetype',
+  # 'status',
+  # 'priority',
+  # 'description',
+  # 'created',
+  # 'updated',
+  # 'parent',
+  # 'subtasks',
+  # 'issuelinks'
+  'key',
+  'summary',
+  'description',
+  'comments',
+  'customfield',
+  'project',
+  'type',
+  'priority',
+  'status',
+  'resolution',
+  'assignee',
+  'reporter',
+  'created',
+  'updated',
+  'resolved',
+  'component',
+  'labels',
+  'environment',
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_xml_url(url: str) -> str:
+  """Pure URL rewrite, cached so sibling-ticket fetches skip urllib parsing"""
   # Convert browse URLs to XML format
   url = convert_jira_browse_url_to_xml(url)
 
   parsed_url = urllib.parse.urlparse(url)
   query_params = urllib.parse.parse_qs(parsed_url.query)
 
-  for field in jira_fields:
-    if 'field' not in query_params:
-      query_params['field'] = []
-    query_params['field'].append(field)
+  query_params.setdefault('field', [])
+  query_params['field'].extend(jira_fields)
 
   new_query = urllib.parse.urlencode(query_params, doseq=True)
-  xml_url = urllib.parse.urlunparse(
+  return urllib.parse.urlunparse(
     (
       parsed_url.scheme,
       parsed_url.netloc,
@@ -487,11 +663,25 @@ def fetch_jira_xml_from_url(url: str, timeout: int = 10) -> str:
     )
   )
 
-  response = requests.get(xml_url, timeout=timeout)
+
+def fetch_jira_xml_from_url(url: str, timeout: int = 10) -> str:
+  xml_url = _build_xml_url(url)
+
+  response = _SESSION.get(xml_url, timeout=timeout)
   response.raise_for_status()
   return response.text
 
 
+def fetch_jira_xml_from_urls(urls: List[str], timeout: int = 10, max_workers: int = 8):
+  """Fetch several tickets in parallel over the shared session, yielding (url, text)"""
+  with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+    futures = {
+      executor.submit(fetch_jira_xml_from_url, url, timeout): url for url in urls
+    }
+    for future in concurrent.futures.as_completed(futures):
+      yield futures[future], future.result()
+
+
 def parse_jira_to_markdown(xml_content: str) -> str:
   try:
     ticket = parse_jira_xml(xml_content)
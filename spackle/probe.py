@@ -1,18 +1,24 @@
 #!/usr/bin/env python
 
+import functools
 import os
 import subprocess
 from typing import List
 import fastmcp
 
 
+@functools.lru_cache(maxsize=1)
 def get_project_root() -> str:
-  """Get the project root directory by looking up from cwd until finding spackle.py"""
+  """Get the project root directory by looking up from cwd until finding spackle.py
+
+  Cached: every tool handler calls this and the server never changes directory,
+  so the walk's stat-per-level only happens once per process.
+  """
   current_dir = os.getcwd()
 
   while current_dir != os.path.dirname(current_dir):  # Stop at filesystem root
     spackle_py_path = os.path.join(current_dir, '.spackle', 'spackle.py')
-    if os.path.exists(spackle_py_path):
+    if os.path.isfile(spackle_py_path):
       return current_dir
     current_dir = os.path.dirname(current_dir)
 
@@ -1,13 +1,53 @@
 #!/usr/bin/env python
 
+import concurrent.futures
 import json
 import os
 import pathlib
+import shlex
 import shutil
 import subprocess
+import threading
 from dataclasses import dataclass, asdict
 from typing import List, Optional
-from urllib.parse import urlparse
+
+# Same optional-orjson arrangement as the main module: C encoder when
+# available, stdlib as a drop-in fallback
+try:
+  import orjson
+
+  def _json_dumps(obj) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+
+  def _json_dumps(obj) -> bytes:
+    return json.dumps(obj, indent=2).encode()
+
+
+# Expand the home directory once; RepoConfig is constructed per CLI invocation
+_HOME = os.path.expanduser('~')
+
+
+def _default_branch(url: str) -> Optional[str]:
+  """Ask the remote for its default branch with one ls-remote round trip"""
+  try:
+    result = subprocess.run(
+      ['git', 'ls-remote', '--symref', url, 'HEAD'],
+      capture_output=True,
+      text=True,
+      check=True,
+      timeout=30,
+    )
+  except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
+    return None
+
+  # 'ref: refs/heads/<name>\tHEAD'
+  for line in result.stdout.splitlines():
+    if line.startswith('ref:'):
+      ref = line.split()[1]
+      if ref.startswith('refs/heads/'):
+        return ref[len('refs/heads/') :]
+  return None
 
 
 @dataclass
@@ -19,40 +59,128 @@ class Repository:
   path: str
   branch: str = 'main'
   commit: Optional[str] = None
+  full_history: bool = False
+
+
+class _GitBatch:
+  """Long-lived `git cat-file --batch-check` pipe for one repository
+
+  Spawning git per object lookup costs a fork+exec each time; a persistent
+  child answers every lookup over one stdin/stdout pipe. Nothing routes
+  through this yet — new features that read blobs or tree entries should use
+  `_GitBatch.for_path(repo.path).lookup(ref)` instead of spawning `git show`.
+  """
+
+  _instances: dict = {}
+
+  def __init__(self, path: str):
+    self.path = path
+    self._proc = None
+
+  @classmethod
+  def for_path(cls, path: str) -> '_GitBatch':
+    batch = cls._instances.get(path)
+    if batch is None:
+      batch = cls._instances[path] = cls(path)
+    return batch
+
+  def _process(self):
+    if self._proc is None or self._proc.poll() is not None:
+      self._proc = subprocess.Popen(
+        [
+          'git',
+          '-C',
+          self.path,
+          'cat-file',
+          '--batch-check=%(objectname) %(objecttype) %(objectsize)',
+        ],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+      )
+    return self._proc
+
+  def lookup(self, ref: str):
+    """Resolve a ref or sha to (objectname, objecttype, objectsize), or None"""
+    proc = self._process()
+    proc.stdin.write(ref + '\n')
+    proc.stdin.flush()
+    line = proc.stdout.readline().strip()
+    if not line or line.endswith(('missing', 'ambiguous')):
+      return None
+    name, object_type, size = line.split()
+    return (name, object_type, int(size))
+
+  def close(self):
+    if self._proc is not None and self._proc.poll() is None:
+      self._proc.stdin.close()
+      self._proc.wait()
+    self._proc = None
 
 
 class RepoConfig:
   """Manages repository configuration stored in ~/.local/share/spackle/spackle.json"""
 
   def __init__(self):
-    self.config_dir = os.path.expanduser('~/.local/share/spackle')
+    self.config_dir = os.path.join(_HOME, '.local', 'share', 'spackle')
     self.config_file = os.path.join(self.config_dir, 'spackle.json')
-    self.cache_dir = os.path.expanduser('~/.cache/spackle/repos')
+    self.cache_dir = os.path.join(_HOME, '.cache', 'spackle', 'repos')
+    self._cached = None
+    self._cached_mtime = None
     self._ensure_directories()
 
   def _ensure_directories(self):
     """Create necessary directories if they don't exist"""
-    os.makedirs(self.config_dir, exist_ok=True)
-    os.makedirs(self.cache_dir, exist_ok=True)
+    # One stat each on the common path; makedirs only when actually missing
+    if not os.path.isdir(self.config_dir):
+      os.makedirs(self.config_dir, exist_ok=True)
+    if not os.path.isdir(self.cache_dir):
+      os.makedirs(self.cache_dir, exist_ok=True)
 
   def load(self) -> List[Repository]:
-    """Load repositories from config file"""
-    if not os.path.exists(self.config_file):
+    """Load repositories from config file, reparsing only when it changed on disk"""
+    try:
+      mtime = os.stat(self.config_file).st_mtime_ns
+    except OSError:
       return []
 
+    if mtime == self._cached_mtime:
+      # Shallow copy so callers can filter/append without corrupting the cache
+      return list(self._cached)
+
     try:
       with open(self.config_file, 'r') as f:
         data = json.load(f)
-        return [Repository(**repo) for repo in data.get('repositories', [])]
+        repositories = [Repository(**repo) for repo in data.get('repositories', [])]
     except (json.JSONDecodeError, KeyError, TypeError):
       # If config is corrupted, start fresh
       return []
 
+    self._cached = repositories
+    self._cached_mtime = mtime
+    return list(repositories)
+
   def save(self, repositories: List[Repository]):
-    """Save repositories to config file"""
+    """Save repositories to config file via an atomic tmpfile replace"""
     data = {'repositories': [asdict(repo) for repo in repositories]}
-    with open(self.config_file, 'w') as f:
-      json.dump(data, f, indent=2)
+    tmp = self.config_file + '.tmp'
+    with open(tmp, 'wb') as f:
+      f.write(_json_dumps(data))
+      f.flush()
+      os.fsync(f.fileno())
+    os.replace(tmp, self.config_file)
+
+    # The just-saved list is the current truth; remember it against the new mtime
+    self._cached = list(repositories)
+    self._cached_mtime = os.stat(self.config_file).st_mtime_ns
+
+  def _mutate(self, fn) -> List[Repository]:
+    """Read the config once, apply fn to the list in place, write once"""
+    repositories = self.load()
+    fn(repositories)
+    self.save(repositories)
+    return repositories
 
   def add_repository(
     self, url_or_path: str, branch: Optional[str] = None
@@ -71,8 +199,7 @@ class RepoConfig:
         url_without_git = url_or_path
 
       # Get the last part of the URL as the name
-      parts = url_without_git.rstrip('/').split('/')
-      repo_name = parts[-1]
+      repo_name = url_without_git.rstrip('/').rsplit('/', 1)[-1]
     else:
       # Local path - use the directory name
       repo_name = os.path.basename(os.path.abspath(url_or_path))
@@ -86,14 +213,21 @@ class RepoConfig:
         # Update branch if specified
         if branch:
           repo.branch = branch
-        self.save(repositories)
-        self._clone_or_update_repo(repo)
+        # Save once, after the update has refreshed the branch and commit; a
+        # failed update leaves the config describing what's on disk instead
+        # of recording a branch switch that never happened
+        if self._clone_or_update_repo(repo):
+          self.save(repositories)
         return repo
 
-    # Create new repository entry
+    # Create new repository entry; when no branch was given, one ls-remote
+    # round trip beats a failed clone + checkout retry on a wrong guess
+    if branch is None:
+      branch = _default_branch(url_or_path) or 'main'
+
     repo_path = os.path.join(self.cache_dir, repo_name)
     new_repo = Repository(
-      name=repo_name, url=url_or_path, path=repo_path, branch=branch or 'main'
+      name=repo_name, url=url_or_path, path=repo_path, branch=branch
     )
 
     # Clone the repository
@@ -122,8 +256,10 @@ class RepoConfig:
       return False
 
     # Remove from config
-    repositories = [r for r in repositories if r.name != name]
-    self.save(repositories)
+    def drop(repos: List[Repository]):
+      repos[:] = [r for r in repos if r.name != name]
+
+    self._mutate(drop)
 
     # Remove cached directory
     if os.path.exists(repo_to_remove.path):
@@ -137,66 +273,151 @@ class RepoConfig:
     """List all managed repositories"""
     return self.load()
 
-  def _clone_or_update_repo(self, repo: Repository):
-    """Clone a repository or update if it exists"""
+  def update_all(self) -> List[Repository]:
+    """Update every managed repository concurrently
+
+    Updates are network-bound, so a thread pool makes the wall clock track the
+    slowest repo instead of the sum. One repo failing doesn't stop the rest.
+    """
+    repositories = self.load()
+    if not repositories:
+      return repositories
+
+    print_lock = threading.Lock()
+
+    def update(repo: Repository):
+      try:
+        self._clone_or_update_repo(repo)
+      except Exception as e:
+        with print_lock:
+          print(f"Warning: could not update '{repo.name}': {e}")
+
+    with concurrent.futures.ThreadPoolExecutor(
+      max_workers=min(8, len(repositories))
+    ) as executor:
+      list(executor.map(update, repositories))
+
+    # One save persists every refreshed commit hash
+    self.save(repositories)
+    return repositories
+
+  def _clone_or_update_repo(self, repo: Repository) -> bool:
+    """Clone a repository or update if it exists
+
+    Returns whether the working tree now matches repo.branch, so callers
+    don't persist config changes the tree never received.
+    """
+    success = True
     if os.path.exists(repo.path):
       # Repository exists, fetch updates
+      # A tiny ls-remote probe tells us whether the remote moved at all; for
+      # stable repos this replaces the whole checkout/pull burst
+      if repo.commit:
+        try:
+          remote = subprocess.run(
+            ['git', 'ls-remote', 'origin', f'refs/heads/{repo.branch}'],
+            cwd=repo.path,
+            capture_output=True,
+            text=True,
+            check=True,
+          ).stdout.split()
+          if remote and remote[0] == repo.commit:
+            print(f'{repo.name} already up to date')
+            return True
+        except subprocess.CalledProcessError:
+          pass  # Probe failed; fall through to the full update
+
       print(f'Updating existing repository at {repo.path}')
       try:
-        # Fetch all branches
-        subprocess.run(
-          ['git', 'fetch', '--all'], cwd=repo.path, check=True, capture_output=True
-        )
-        # Checkout the specified branch
-        subprocess.run(
-          ['git', 'checkout', repo.branch],
+        # Chain checkout/pull/rev-parse through one shell so the update costs
+        # a single fork; pull runs its own fetch, so a separate fetch --all
+        # would just be a second ref negotiation with the remote. The last
+        # stdout line is the new HEAD, replacing a rev-parse spawn
+        branch = shlex.quote(repo.branch)
+
+        # When the branch isn't known locally (switching an existing cache to
+        # a branch created after clone), fall back to fetching it explicitly
+        # before retrying the checkout; the common same-branch update still
+        # pays only pull's ref negotiation
+        fetch_flags = '--no-tags --prune'
+        if not repo.full_history:
+          fetch_flags += ' --depth=1'
+
+        # set-branches widens the --single-branch fetch refspec so later plain
+        # fetches, pulls, and prunes see the new branch too, not just this
+        # one explicit-refspec fetch; it runs after the fetch so a bad branch
+        # name can't leave a refspec that wedges every later fetch
+        result = subprocess.run(
+          f'git checkout {branch}'
+          f' || {{ git fetch {fetch_flags} origin'
+          f' {branch}:refs/remotes/origin/{branch}'
+          f' && git remote set-branches --add origin {branch}'
+          f' && git checkout -B {branch} refs/remotes/origin/{branch}; }}'
+          f' && git pull --ff-only --autostash --no-tags --prune'
+          f' origin {branch} && git rev-parse HEAD',
+          shell=True,
           cwd=repo.path,
           check=True,
           capture_output=True,
+          text=True,
         )
-        # Pull latest changes
-        subprocess.run(['git', 'pull'], cwd=repo.path, check=True, capture_output=True)
+        repo.commit = result.stdout.strip().splitlines()[-1]
         print(f'Updated to latest {repo.branch}')
+        return True
       except subprocess.CalledProcessError as e:
         print(f'Warning: Could not update repository: {e}')
+        success = False
+
+        # Re-read the branch actually checked out so a partial failure (say,
+        # checkout succeeded but pull didn't) can't record a branch the tree
+        # isn't on
+        actual_branch = subprocess.run(
+          ['git', 'symbolic-ref', '--short', 'HEAD'],
+          cwd=repo.path,
+          capture_output=True,
+          text=True,
+        ).stdout.strip()
+        if actual_branch:
+          repo.branch = actual_branch
     else:
       # Clone new repository
       print(f'Cloning {repo.url} to {repo.path}')
       try:
         cmd = ['git', 'clone']
 
-        # Add branch flag if not main/master
+        # Spackle only consumes the checked-out tree, so skip old blobs,
+        # history, and other branches unless the user opted into full history
+        if not repo.full_history:
+          cmd.extend(['--filter=blob:none', '--depth=1', '--single-branch'])
+
+        # Add branch flag if not main/master; those come from a default-branch
+        # guess, and the clone checks the remote's real default out anyway
         if repo.branch and repo.branch not in ['main', 'master']:
           cmd.extend(['-b', repo.branch])
 
         cmd.extend([repo.url, repo.path])
 
-        subprocess.run(cmd, check=True, capture_output=True)
-        print(f'Cloned successfully (branch: {repo.branch})')
+        # Clone output is never read on success; discard it instead of having
+        # the parent drain a pipe. stderr stays piped so errors surface
+        subprocess.run(
+          cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
 
-        # If branch is main or master but doesn't exist, try the other
+        # Record whichever branch the clone actually checked out; one local
+        # symbolic-ref replaces the old checkout-and-retry fallback
         if repo.branch in ['main', 'master']:
-          try:
-            subprocess.run(
-              ['git', 'checkout', repo.branch],
-              cwd=repo.path,
-              check=True,
-              capture_output=True,
-            )
-          except subprocess.CalledProcessError:
-            # Try the alternative
-            alt_branch = 'master' if repo.branch == 'main' else 'main'
-            try:
-              subprocess.run(
-                ['git', 'checkout', alt_branch],
-                cwd=repo.path,
-                check=True,
-                capture_output=True,
-              )
-              repo.branch = alt_branch
-              print(f"Note: Using branch '{alt_branch}' instead of '{repo.branch}'")
-            except subprocess.CalledProcessError:
-              pass  # Keep original branch
+          result = subprocess.run(
+            ['git', 'symbolic-ref', '--short', 'HEAD'],
+            cwd=repo.path,
+            capture_output=True,
+            text=True,
+          )
+          actual_branch = result.stdout.strip()
+          if actual_branch and actual_branch != repo.branch:
+            print(f"Note: Using branch '{actual_branch}' instead of '{repo.branch}'")
+            repo.branch = actual_branch
+
+        print(f'Cloned successfully (branch: {repo.branch})')
 
       except subprocess.CalledProcessError as e:
         print(f'Error cloning repository: {e}')
@@ -216,3 +437,4 @@ class RepoConfig:
       repo.commit = result.stdout.strip()
     except subprocess.CalledProcessError:
       repo.commit = None
+    return success
@@ -4,8 +4,10 @@
 
 
 import os
+import re
 import sqlite3
 import sys
+import threading
 
 import spackle
 
@@ -13,7 +15,14 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
-from fastmcp import FastMCP
+
+# Tokenizes quoted strings and bare semicolons in one C-level scan; a ; match
+# is by construction outside quotes
+_STMT_SCAN = re.compile(r"'[^']*'|\"[^\"]*\"|;")
+
+# Case-insensitive validation without the full-string .lower() copy
+_STARTS_SELECT = re.compile(r'\s*(?:select|with)\b', re.IGNORECASE)
+_HAS_LIMIT = re.compile(r'\blimit\b', re.IGNORECASE)
 
 
 @dataclass
@@ -27,6 +36,9 @@ class ColumnInfo:
 
 
 class SqliteConnection:
+  """Per-use connection context manager, kept for standalone scripts; the MCP
+  server holds one persistent connection instead"""
+
   def __init__(self, db_path: Path):
     self.db_path = db_path
     self.conn = None
@@ -43,10 +55,23 @@ class SqliteConnection:
 
 @spackle.mcp(name='sqlite')
 def sqlite_server(db_path: Optional[str] = None):
+  from fastmcp import FastMCP
+
   mcp = FastMCP('spackle-sqlite')
 
   db_path_obj = Path(db_path) if db_path else Path('database.db')
 
+  # One long-lived read-only connection shared by every tool call; connecting
+  # per call re-read the schema and rebuilt the page cache each time. fastmcp
+  # may service calls from worker threads, hence the lock
+  conn = sqlite3.connect(str(db_path_obj), check_same_thread=False)
+  conn.row_factory = sqlite3.Row
+  conn.execute('PRAGMA query_only=ON')
+  conn_lock = threading.Lock()
+
+  # Table schemas don't change under a read-only server; describe once each
+  schema_cache: Dict[str, List[ColumnInfo]] = {}
+
   def read_query(
     query: str,
     params: Optional[List[Any]] = None,
@@ -73,45 +98,35 @@ def sqlite_server(db_path: Optional[str] = None):
 
     # Check for multiple statements by looking for semicolons not inside quotes
     def contains_multiple_statements(sql: str) -> bool:
-      in_single_quote = False
-      in_double_quote = False
-      for char in sql:
-        if char == "'" and not in_double_quote:
-          in_single_quote = not in_single_quote
-        elif char == '"' and not in_single_quote:
-          in_double_quote = not in_double_quote
-        elif char == ';' and not in_single_quote and not in_double_quote:
-          return True
-      return False
+      return any(m.group() == ';' for m in _STMT_SCAN.finditer(sql))
 
     if contains_multiple_statements(query):
       raise ValueError('Multiple SQL statements are not allowed')
 
     # Validate query type (allowing common CTEs)
-    query_lower = query.lower()
-    if not any(query_lower.startswith(prefix) for prefix in ('select', 'with')):
+    if not _STARTS_SELECT.match(query):
       raise ValueError(
         'Only SELECT queries (including WITH clauses) are allowed for safety'
       )
 
     params = params or []
 
-    with SqliteConnection(db_path_obj) as conn:
+    with conn_lock:
       cursor = conn.cursor()
 
       try:
         # Only add LIMIT if query doesn't already have one
-        if 'limit' not in query_lower:
+        if not _HAS_LIMIT.search(query):
           query = f'{query} LIMIT {row_limit}'
 
         cursor.execute(query, params)
 
-        if fetch_all:
-          results = cursor.fetchall()
-        else:
-          results = [cursor.fetchone()]
+        # fetchmany caps the materialized rows at the limit, and zipping a
+        # cached column list skips sqlite3.Row's per-item keyed access
+        rows = cursor.fetchmany(row_limit) if fetch_all else [cursor.fetchone()]
+        cols = [d[0] for d in cursor.description]
 
-        return [dict(row) for row in results if row is not None]
+        return [dict(zip(cols, row)) for row in rows if row is not None]
 
       except sqlite3.Error as e:
         raise ValueError(f'Sqlite error: {str(e)}')
@@ -122,12 +137,12 @@ def sqlite_server(db_path: Optional[str] = None):
     Returns:
       List of table names in the database
     """
-    with SqliteConnection(db_path_obj) as conn:
+    with conn_lock:
       cursor = conn.cursor()
 
       try:
         cursor.execute("""
-            SELECT name FROM sqlite_master 
+            SELECT name FROM sqlite_master
             WHERE type='table' 
             ORDER BY name
         """)
@@ -152,14 +167,18 @@ def sqlite_server(db_path: Optional[str] = None):
       - dflt_value: Default value for the column (str or None)
       - pk: Whether the column is part of the primary key (int: 0=no, 1=yes)
     """
-    with SqliteConnection(db_path_obj) as conn:
+    cached = schema_cache.get(table_name)
+    if cached is not None:
+      return cached
+
+    with conn_lock:
       cursor = conn.cursor()
 
       try:
         # Verify table exists
         cursor.execute(
           """
-            SELECT name FROM sqlite_master 
+            SELECT name FROM sqlite_master
             WHERE type='table' AND name=?
         """,
           [table_name],
@@ -168,11 +187,12 @@ def sqlite_server(db_path: Optional[str] = None):
         if not cursor.fetchone():
           raise ValueError(f"Table '{table_name}' does not exist")
 
-        # Get table schema
-        cursor.execute(f'PRAGMA table_info({table_name})')
+        # Get table schema; the table-valued pragma takes a real parameter,
+        # unlike the f-string PRAGMA it replaces
+        cursor.execute('SELECT * FROM pragma_table_info(?)', [table_name])
         columns = cursor.fetchall()
 
-        return [
+        result = [
           ColumnInfo(
             cid=row['cid'],
             name=row['name'],
@@ -183,6 +203,8 @@ def sqlite_server(db_path: Optional[str] = None):
           )
           for row in columns
         ]
+        schema_cache[table_name] = result
+        return result
 
       except sqlite3.Error as e:
         raise ValueError(f'SQLite error: {str(e)}')
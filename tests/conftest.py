@@ -0,0 +1,25 @@
+#!/usr/bin/env python
+
+import pytest
+
+import spackle
+
+
+@pytest.fixture(autouse=True)
+def _isolate_spackle_state():
+  """Snapshot and restore the process-global spackle registries per test
+
+  The load/tool/prompt decorators mutate registries on the shared Spackle
+  instance; restoring them here keeps tests order-independent (and safe under
+  xdist) without each test clearing state by hand.
+  """
+  tools = spackle.spackle.tools.copy()
+  prompts = spackle.spackle.prompts.copy()
+  prompt_files = spackle.spackle.prompt_files.copy()
+  yield
+  spackle.spackle.tools.clear()
+  spackle.spackle.tools.update(tools)
+  spackle.spackle.prompts.clear()
+  spackle.spackle.prompts.update(prompts)
+  spackle.spackle.prompt_files.clear()
+  spackle.spackle.prompt_files.update(prompt_files)
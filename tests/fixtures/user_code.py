@@ -0,0 +1,18 @@
+#!/usr/bin/env python
+
+import spackle
+
+
+@spackle.load
+def initialize_test_tools():
+  @spackle.tool
+  def test_tool():
+    return spackle.McpResult(
+      return_code=0, response='Test tool executed successfully!', stderr='', stdout=''
+    )
+
+  @spackle.tool
+  def another_test_tool():
+    return spackle.McpResult(
+      return_code=0, response='Another tool works too!', stderr='', stdout=''
+    )
@@ -24,12 +24,17 @@ class Paths:
     self.test = os.path.join(self.asset, 'test')
 
 
-@pytest.fixture
+# The paths never change mid-run; resolve them (realpath stats the
+# filesystem) once at import instead of per fixture request
+_PATHS = Paths()
+
+
+@pytest.fixture(scope='session')
 def paths():
-  return Paths()
+  return _PATHS
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def sample_xml(paths):
   """Load the sanitized test XML file"""
   xml_path = os.path.join(paths.test, 'sample.xml')
@@ -37,6 +42,12 @@ def sample_xml(paths):
     return f.read()
 
 
+@pytest.fixture(scope='session')
+def parsed_sample_ticket(sample_xml):
+  """Parse the sample XML once for the read-only assertions against it"""
+  return parse_jira_xml(sample_xml)
+
+
 @pytest.fixture
 def duplicate_rel_xml():
   """Create test XML with duplicate rel attributes"""
@@ -96,20 +107,18 @@ class TestMarkdownFormatter:
     formatter.add_line_break()
     assert formatter.lines == ['']
 
-  def test_add_field_with_value(self):
+  @pytest.mark.parametrize(
+    'value,expected',
+    [
+      ('Open', ['**Status:** Open']),
+      (None, []),
+      ('', []),
+    ],
+  )
+  def test_add_field(self, value, expected):
     formatter = MarkdownFormatter()
-    formatter.add_field('Status', 'Open')
-    assert formatter.lines == ['**Status:** Open']
-
-  def test_add_field_with_none_value(self):
-    formatter = MarkdownFormatter()
-    formatter.add_field('Status', None)
-    assert formatter.lines == []
-
-  def test_add_field_with_empty_value(self):
-    formatter = MarkdownFormatter()
-    formatter.add_field('Status', '')
-    assert formatter.lines == []
+    formatter.add_field('Status', value)
+    assert formatter.lines == expected
 
   def test_add_list_with_items(self):
     formatter = MarkdownFormatter()
@@ -159,6 +168,31 @@ class TestPreprocessing:
     result = strip_html(html)
     assert 'Line 1\nLine 2' in result
 
+  def test_strip_html_selectolax_parity(self, monkeypatch):
+    """The optional selectolax fast path must match the lxml path exactly"""
+    pytest.importorskip('selectolax')
+    import spackle.jira as jira
+
+    samples = [
+      '<p>Hello <b>world</b></p>',
+      '<div><p>a</p>x<p>b</p></div>',
+      '<p>x</p>tail',
+      '<p>one</p><p>two</p>',
+      'Line 1<br/>Line 2',
+      '<p>Line 1<br/>Line 2</p>after',
+    ]
+    fast = [jira.strip_html(html) for html in samples]
+
+    # Force the lxml path and re-run the same inputs
+    monkeypatch.setattr(jira, '_FastHTMLParser', None)
+    slow = [jira.strip_html(html) for html in samples]
+
+    assert fast == slow
+
+  def test_strip_html_plain_text(self):
+    result = strip_html('No markup at all')
+    assert result == 'No markup at all'
+
   def test_strip_html_empty(self):
     result = strip_html('')
     assert result == ''
@@ -235,27 +269,27 @@ class TestJiraXmlParsing:
     assert ticket.assignee == 'John Doe'
     assert ticket.reporter == 'Jane Smith'
 
-  def test_parse_jira_xml_project_info(self, sample_xml):
+  def test_parse_jira_xml_project_info(self, parsed_sample_ticket):
     """Test project information extraction"""
-    ticket = parse_jira_xml(sample_xml)
+    ticket = parsed_sample_ticket
 
     assert ticket.project is not None
     assert ticket.project.name == 'Example Project Services'
     assert ticket.project.key == 'TEST'
     assert ticket.project.id == '10119'
 
-  def test_parse_jira_xml_components_and_labels(self, sample_xml):
+  def test_parse_jira_xml_components_and_labels(self, parsed_sample_ticket):
     """Test components and labels extraction"""
-    ticket = parse_jira_xml(sample_xml)
+    ticket = parsed_sample_ticket
 
     assert 'Core Component' in ticket.components
     assert 'Example_Template' in ticket.labels
     assert 'example_label' in ticket.labels
     assert 'support_label' in ticket.labels
 
-  def test_parse_jira_xml_comments(self, sample_xml):
+  def test_parse_jira_xml_comments(self, parsed_sample_ticket):
     """Test comments extraction"""
-    ticket = parse_jira_xml(sample_xml)
+    ticket = parsed_sample_ticket
 
     assert len(ticket.comments) > 0
     first_comment = ticket.comments[0]
@@ -263,9 +297,9 @@ class TestJiraXmlParsing:
     assert first_comment.author == 'user-id-003'
     assert 'Lorem ipsum dolor' in first_comment.text
 
-  def test_parse_jira_xml_custom_fields(self, sample_xml):
+  def test_parse_jira_xml_custom_fields(self, parsed_sample_ticket):
     """Test custom fields extraction"""
-    ticket = parse_jira_xml(sample_xml)
+    ticket = parsed_sample_ticket
 
     assert len(ticket.custom_fields) > 0
     assert 'Actual Discovery Stage' in ticket.custom_fields
@@ -457,42 +491,38 @@ class TestIntegration:
 class TestURLConversion:
   """Test URL conversion functions"""
 
-  def test_convert_jira_browse_url_to_xml_basic(self):
-    """Test basic browse URL to XML conversion"""
-    browse_url = 'https://example.atlassian.net/browse/SLG-999'
-    expected = (
-      'https://example.atlassian.net/si/jira.issueviews:issue-xml/SLG-999/SLG-999.xml'
-    )
-    result = convert_jira_browse_url_to_xml(browse_url)
-    assert result == expected
-
-  def test_convert_jira_browse_url_to_xml_with_subdomain(self):
-    """Test browse URL conversion with complex domain"""
-    browse_url = 'https://ncrvoyix-saas.atlassian.net/browse/EFS-8517'
-    expected = 'https://ncrvoyix-saas.atlassian.net/si/jira.issueviews:issue-xml/EFS-8517/EFS-8517.xml'
-    result = convert_jira_browse_url_to_xml(browse_url)
-    assert result == expected
-
-  def test_convert_jira_browse_url_to_xml_complex_ticket_key(self):
-    """Test with complex ticket key"""
-    browse_url = 'https://example.atlassian.net/browse/PROJECT-12345'
-    expected = 'https://example.atlassian.net/si/jira.issueviews:issue-xml/PROJECT-12345/PROJECT-12345.xml'
-    result = convert_jira_browse_url_to_xml(browse_url)
-    assert result == expected
-
-  def test_convert_jira_browse_url_to_xml_non_browse_url(self):
-    """Test that non-browse URLs are returned unchanged"""
-    xml_url = (
-      'https://example.atlassian.net/si/jira.issueviews:issue-xml/SLG-999/SLG-999.xml'
-    )
-    result = convert_jira_browse_url_to_xml(xml_url)
-    assert result == xml_url
-
-  def test_convert_jira_browse_url_to_xml_malformed_browse_url(self):
-    """Test with malformed browse URL"""
-    malformed_url = 'https://example.atlassian.net/browse/'
-    result = convert_jira_browse_url_to_xml(malformed_url)
-    assert result == malformed_url  # Should return original if can't parse
+  @pytest.mark.parametrize(
+    'url,expected',
+    [
+      # Basic browse URL
+      (
+        'https://example.atlassian.net/browse/SLG-999',
+        'https://example.atlassian.net/si/jira.issueviews:issue-xml/SLG-999/SLG-999.xml',
+      ),
+      # Complex domain
+      (
+        'https://ncrvoyix-saas.atlassian.net/browse/EFS-8517',
+        'https://ncrvoyix-saas.atlassian.net/si/jira.issueviews:issue-xml/EFS-8517/EFS-8517.xml',
+      ),
+      # Complex ticket key
+      (
+        'https://example.atlassian.net/browse/PROJECT-12345',
+        'https://example.atlassian.net/si/jira.issueviews:issue-xml/PROJECT-12345/PROJECT-12345.xml',
+      ),
+      # Non-browse URLs are returned unchanged
+      (
+        'https://example.atlassian.net/si/jira.issueviews:issue-xml/SLG-999/SLG-999.xml',
+        'https://example.atlassian.net/si/jira.issueviews:issue-xml/SLG-999/SLG-999.xml',
+      ),
+      # Malformed browse URL returns the original
+      (
+        'https://example.atlassian.net/browse/',
+        'https://example.atlassian.net/browse/',
+      ),
+    ],
+  )
+  def test_convert_jira_browse_url_to_xml(self, url, expected):
+    assert convert_jira_browse_url_to_xml(url) == expected
 
 
 if __name__ == '__main__':
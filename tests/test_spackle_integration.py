@@ -1,103 +1,62 @@
 #!/usr/bin/env python
 
+import contextlib
 import json
-import subprocess
 from pathlib import Path
 import pytest
-import tempfile
 import shutil
+import subprocess
+import sys
 import os
 
 import spackle
 
 
-@pytest.fixture
-def temp_project_dir():
-  temp_dir = tempfile.mkdtemp()
-  yield Path(temp_dir)
-  # Cleanup after test
-  shutil.rmtree(temp_dir, ignore_errors=True)
+@contextlib.contextmanager
+def chdir(path):
+  """contextlib.chdir backport; the package still supports Python 3.10"""
+  original_cwd = os.getcwd()
+  os.chdir(path)
+  try:
+    yield
+  finally:
+    os.chdir(original_cwd)
 
 
 @pytest.fixture
-def test_user_code_file(tmp_path):
-  # Create the .spackle directory first
-  spackle_dir = tmp_path / '.spackle'
-  spackle_dir.mkdir(exist_ok=True)
+def temp_project_dir(tmp_path):
+  # Ride pytest's tmp_path instead of mkdtemp/rmtree; cleanup is handled by
+  # pytest's rotation. A subdirectory keeps it apart from fixtures that also
+  # build under tmp_path
+  project_dir = tmp_path / 'project'
+  project_dir.mkdir()
+  return project_dir
 
-  test_code = """#!/usr/bin/env python
 
-import spackle
-
-@spackle.load
-def initialize_test_tools():
-    @spackle.tool
-    def test_tool():
-        return spackle.McpResult(
-            return_code=0,
-            response="Test tool executed successfully!",
-            stderr="",
-            stdout=""
-        )
-
-    @spackle.tool
-    def another_test_tool():
-        return spackle.McpResult(
-            return_code=0,
-            response="Another tool works too!",
-            stderr="",
-            stdout=""
-        )
-"""
-
-  test_file = tmp_path / '.spackle' / 'spackle.py'
-  test_file.write_text(test_code)
-  return test_file
-
-
-def run_command(cmd, cwd=None):
-  result = subprocess.run(cmd, shell=True, cwd=cwd, capture_output=True, text=True)
-  return result.returncode == 0, result.stdout, result.stderr
+@pytest.fixture(scope='session')
+def test_user_code_file():
+  # The payload lives as a real file under tests/fixtures, so nothing is
+  # written at all; tests that need it inside their project copy it there
+  return Path(__file__).parent / 'fixtures' / 'user_code.py'
 
 
 def test_spackle_build_with_user_code(temp_project_dir, test_user_code_file):
-  # Setup project
+  # Set up the project with the test user code in place
   spackle_dir = temp_project_dir / '.spackle'
-  spackle_dir.mkdir(exist_ok=True)
-
-  # Copy the test user code file to the temp project directory
-  project_spackle_dir = temp_project_dir / '.spackle'
-  project_spackle_dir.mkdir(exist_ok=True)
-  project_spackle_py = project_spackle_dir / 'spackle.py'
-  shutil.copy(test_user_code_file, project_spackle_py)
+  spackle_dir.mkdir()
+  shutil.copy(test_user_code_file, spackle_dir / 'spackle.py')
 
-  # Run spackle build directly through the API
-  original_cwd = Path.cwd()
-  try:
-    os.chdir(temp_project_dir)
+  # Build and exercise both tools through the API from one chdir
+  with chdir(temp_project_dir):
     spackle.spackle.build()
-  finally:
-    os.chdir(original_cwd)
 
-  # Test spackle tool command through the API
-  original_cwd = Path.cwd()
-  try:
-    os.chdir(temp_project_dir)
     result = spackle.spackle.run_tool('test_tool')
     assert result.return_code == 0
     assert 'Test tool executed successfully!' in result.response
-  finally:
-    os.chdir(original_cwd)
 
-  # Test another tool through the API
-  original_cwd = Path.cwd()
-  try:
-    os.chdir(temp_project_dir)
     result = spackle.spackle.run_tool('another_test_tool')
     assert result.return_code == 0
     assert 'Another tool works too!' in result.response
-  finally:
-    os.chdir(original_cwd)
 
 
 def test_load_decorator_executes_immediately():
@@ -131,51 +90,53 @@ def test_spackle_build_creates_claude_files(temp_project_dir):
   """Test that spackle build creates the necessary Claude configuration files"""
 
   # Run spackle build directly through the API
-  original_cwd = Path.cwd()
-  try:
-    os.chdir(temp_project_dir)
+  with chdir(temp_project_dir):
     spackle.spackle.build()
-  finally:
-    os.chdir(original_cwd)
-
-  # Check that CLAUDE.md is created
-  claude_md = temp_project_dir / 'CLAUDE.md'
-  assert claude_md.exists(), 'CLAUDE.md should be created by spackle build'
 
-  # Check that .claude directory and settings.local.json are created
-  claude_dir = temp_project_dir / '.claude'
-  assert claude_dir.exists(), '.claude directory should be created by spackle build'
+  # Check the created artifacts with one scandir per directory instead of a
+  # stat per file
+  top_level = {entry.name for entry in os.scandir(temp_project_dir)}
+  assert 'CLAUDE.md' in top_level, 'CLAUDE.md should be created by spackle build'
+  assert '.claude' in top_level, '.claude directory should be created by spackle build'
+  assert '.mcp.json' in top_level, '.mcp.json should be created by spackle build'
 
-  settings_file = claude_dir / 'settings.local.json'
-  assert settings_file.exists(), (
+  claude_entries = {entry.name for entry in os.scandir(temp_project_dir / '.claude')}
+  assert 'settings.local.json' in claude_entries, (
     '.claude/settings.local.json should be created by spackle build'
   )
 
-  # Verify the settings file contains expected structure
-  with open(settings_file, 'r') as f:
-    settings = json.load(f)
-    assert 'permissions' in settings, 'settings should contain permissions'
-    assert 'enabledMcpjsonServers' in settings, (
-      'settings should contain enabledMcpjsonServers'
-    )
-    assert 'spackle-main' in settings['enabledMcpjsonServers'], (
-      'spackle-main should be enabled'
-    )
-    assert 'spackle-probe' in settings['enabledMcpjsonServers'], (
-      'spackle-probe should be enabled'
-    )
-
-  # Check that .mcp.json is created
-  mcp_config = temp_project_dir / '.mcp.json'
-  assert mcp_config.exists(), '.mcp.json should be created by spackle build'
+  # Verify the settings file contains expected structure; slurp-and-parse
+  # instead of streaming the decoder over a file object
+  settings_file = temp_project_dir / '.claude' / 'settings.local.json'
+  settings = json.loads(settings_file.read_text())
+  assert 'permissions' in settings, 'settings should contain permissions'
+  assert 'enabledMcpjsonServers' in settings, (
+    'settings should contain enabledMcpjsonServers'
+  )
+  assert 'spackle-main' in settings['enabledMcpjsonServers'], (
+    'spackle-main should be enabled'
+  )
+  assert 'spackle-probe' in settings['enabledMcpjsonServers'], (
+    'spackle-probe should be enabled'
+  )
+
+
+@pytest.mark.subprocess
+def test_spackle_cli_smoke():
+  """The one test that still spawns a process: verifies the entrypoint wiring
+
+  Everything else runs in-process; this covers what that can't, namely that
+  'python -m spackle' resolves to the CLI at all.
+  """
+  result = subprocess.run(
+    [sys.executable, '-m', 'spackle', '--help'], capture_output=True, text=True
+  )
+  assert result.returncode == 0
+  assert 'Spackle' in result.stdout
 
 
 def test_prompt_decorator_without_build():
   """Test that the prompt decorator stores functions correctly"""
-  import spackle
-
-  # Clear any existing prompts
-  spackle.spackle.prompts.clear()
 
   @spackle.prompt
   def test_command():
@@ -192,10 +153,6 @@ def test_prompt_decorator_without_build():
 
 def test_prompt_file_decorator_without_build():
   """Test that the prompt_file decorator stores file paths correctly"""
-  import spackle
-
-  # Clear any existing prompt files
-  spackle.spackle.prompt_files.clear()
 
   @spackle.prompt_file
   def test_file_command():